@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from typing import Iterable, Literal, overload
+
+from .exceptions import ConnectionError
+from .models import ScanResult, VersionInfo
+from .sockets import (
+    _SIZE_STRUCT,
+    _ZERO_SIZE,
+    DEFAULT_MAX_CHUNK_SIZE,
+    DEFAULT_UNIX_SOCKET_PATH,
+    _absolute_path,
+    _BaseClamdSocket,
+    _check_response,
+    _parse_instream_result,
+    _parse_scan_lines,
+)
+from .typing import StrPath, SupportsRead
+
+DEFAULT_CONCURRENCY = 10
+
+
+async def _close(writer: asyncio.StreamWriter) -> None:
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        # The connection might already be closed by clamd:
+        pass
+
+
+class AsyncClamdNetworkSocket(_BaseClamdSocket):
+    """A class to interact with clamd with a network socket (`socket.AF_INET`), using `asyncio`.
+
+    Any event loop implementation can be used (e.g. [uvloop](https://github.com/MagicStack/uvloop)).
+
+    Args:
+        host: The host clamd is listening on.
+        port: The port clamd is listening on.
+        timeout: The timeout (in seconds) when connecting and waiting for a reply. Default: no timeout.
+        max_chunk_size: The maximum size of the chunks sent with the `INSTREAM` command. Default: 64 KiB.
+        line_terminator: The character used to terminate lines, either `n` (newline) or `z` (`NULL`).
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 3310,
+        timeout: float | None = None,
+        max_chunk_size: int = DEFAULT_MAX_CHUNK_SIZE,
+        line_terminator: Literal["n", "z"] = "n",
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.max_chunk_size = max_chunk_size
+        self.line_terminator = line_terminator
+
+    async def _open_connection(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        try:
+            return await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        except asyncio.TimeoutError:
+            raise ConnectionError(f"Error while connecting to {self.host}:{self.port}: timed out")
+        except OSError as e:
+            if len(e.args) == 1:
+                raise ConnectionError(f"Error while connecting to {self.host}:{self.port}: {e.args[0]}")
+            raise ConnectionError(f"Error while connecting to {self.host}:{self.port}: {e.args[1]}", int(e.args[0]))
+
+    async def _command(self, command: str, *args: str, raise_on_error: bool = True) -> str:
+        return (await self._command_bytes(command, *args, raise_on_error=raise_on_error)).decode("utf-8")
+
+    async def _command_bytes(self, command: str, *args: str, raise_on_error: bool = True) -> bytes:
+        reader, writer = await self._open_connection()
+        try:
+            writer.write(self._encode_command(command, *args))
+            await writer.drain()
+            recv = await self._recv_bytes(reader)
+        finally:
+            await _close(writer)
+        return _check_response(command, recv, raise_on_error=raise_on_error)
+
+    async def _recv_bytes(self, reader: asyncio.StreamReader) -> bytes:
+        try:
+            # clamd closes the connection once the reply is sent:
+            recv = await asyncio.wait_for(reader.read(), self.timeout)
+        except asyncio.TimeoutError:
+            raise ConnectionError("Error while reading from socket: timed out")
+        except OSError as e:
+            if len(e.args) == 1:
+                raise ConnectionError(f"Error while reading from socket: {e.args[0]}")
+            raise ConnectionError(f"Error while reading from socket: {e.args[1]}", int(e.args[0]))
+        return recv.strip(self._terminator)
+
+    @overload
+    async def _any_scan(self, command: str, path: StrPath, raw: Literal[True]) -> str:
+        ...
+
+    @overload
+    async def _any_scan(self, command: str, path: StrPath, raw: Literal[False] = ...) -> list[ScanResult]:
+        ...
+
+    async def _any_scan(self, command: str, path: StrPath, raw: bool = False) -> list[ScanResult] | str:
+        result = await self._command_bytes(command, _absolute_path(path), raise_on_error=False)
+        if raw:
+            return result.decode("utf-8")
+        return list(_parse_scan_lines(command, result.split(self._terminator)))
+
+    async def ping(self) -> str:
+        """Check the server's state. It should reply with "PONG"."""
+
+        return await self._command("PING")
+
+    async def reload(self) -> str:
+        """Reload the virus databases."""
+
+        return await self._command("RELOAD")
+
+    async def shutdown(self) -> None:
+        """Perform a clean exit."""
+
+        _, writer = await self._open_connection()
+        try:
+            writer.write(self._encode_command("SHUTDOWN"))
+            await writer.drain()
+        finally:
+            await _close(writer)
+
+    @overload
+    async def version(self, raw: Literal[True]) -> str:
+        ...
+
+    @overload
+    async def version(self, raw: Literal[False] = ...) -> VersionInfo:
+        ...
+
+    async def version(self, raw: bool = False) -> VersionInfo | str:
+        """Print program and database versions.
+
+        Args:
+            raw: Whether the raw string response should be returned. Default: False.
+        """
+        rv = await self._command("VERSION")
+        if raw:
+            return rv
+        return VersionInfo._from_str(rv)
+
+    async def stats(self) -> str:
+        """Replies with statistics about the scan queue, contents of scan queue, and memory
+        usage. The exact reply format is subject to change in future releases.
+        """
+
+        return await self._command("STATS")
+
+    @overload
+    async def scan(self, path: StrPath, raw: Literal[True]) -> str:
+        ...
+
+    @overload
+    async def scan(self, path: StrPath, raw: Literal[False] = ...) -> list[ScanResult]:
+        ...
+
+    async def scan(self, path: StrPath, raw: bool = False) -> list[ScanResult] | str:
+        """Scan a file or a directory (recursively) with archive support enabled (if not disabled in clamd.conf).
+        A full path is required.
+        """
+
+        return await self._any_scan("SCAN", path, raw)  # type: ignore[call-overload]
+
+    @overload
+    async def contscan(self, path: StrPath, raw: Literal[True]) -> str:
+        ...
+
+    @overload
+    async def contscan(self, path: StrPath, raw: Literal[False] = ...) -> list[ScanResult]:
+        ...
+
+    async def contscan(self, path: StrPath, raw: bool = False) -> list[ScanResult] | str:
+        """Scan file or directory (recursively) with archive support enabled and don't stop
+        the scanning when a virus is found.
+        """
+
+        return await self._any_scan("CONTSCAN", path, raw)  # type: ignore[call-overload]
+
+    @overload
+    async def multiscan(self, path: StrPath, raw: Literal[True]) -> str:
+        ...
+
+    @overload
+    async def multiscan(self, path: StrPath, raw: Literal[False] = ...) -> list[ScanResult]:
+        ...
+
+    async def multiscan(self, path: StrPath, raw: bool = False) -> list[ScanResult] | str:
+        """Scan file in a standard way or scan directory (recursively) using multiple threads
+        (to make the scanning faster on SMP machines).
+        """
+
+        return await self._any_scan("MULTISCAN", path, raw)  # type: ignore[call-overload]
+
+    async def scan_many(
+        self, paths: Iterable[StrPath], concurrency: int = DEFAULT_CONCURRENCY
+    ) -> list[list[ScanResult]]:
+        """Scan multiple files or directories concurrently, using the `SCAN` command.
+        Results are returned in the same order as the paths.
+
+        Args:
+            paths: The paths to scan.
+            concurrency: The maximum number of concurrent connections to clamd. Default: 10.
+        """
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def scan(path: StrPath) -> list[ScanResult]:
+            async with semaphore:
+                return await self.scan(path)
+
+        return await asyncio.gather(*(scan(path) for path in paths))
+
+    @overload
+    async def instream(
+        self,
+        buff: SupportsRead[bytes],
+        raw: Literal[True],
+        max_chunk_size: int | None = ...,
+    ) -> str:
+        ...
+
+    @overload
+    async def instream(
+        self,
+        buff: SupportsRead[bytes],
+        raw: Literal[False] = ...,
+        max_chunk_size: int | None = ...,
+    ) -> ScanResult:
+        ...
+
+    async def instream(
+        self,
+        buff: SupportsRead[bytes],
+        raw: bool = False,
+        max_chunk_size: int | None = None,
+    ) -> ScanResult | str:
+        """Scan a stream of data. The stream is sent to clamd in chunks, after INSTREAM,
+        on the same socket on which the command was sent.
+        """
+
+        max_chunk_size = max_chunk_size or self.max_chunk_size
+        reader, writer = await self._open_connection()
+        try:
+            writer.write(self._encode_command("INSTREAM"))
+            while chunk := buff.read(max_chunk_size):
+                writer.writelines([_SIZE_STRUCT.pack(len(chunk)), chunk])
+                await writer.drain()
+            writer.write(_ZERO_SIZE)
+            await writer.drain()
+            result = await self._recv_bytes(reader)
+        finally:
+            await _close(writer)
+
+        return _parse_instream_result(result, raw)
+
+
+class AsyncClamdUnixSocket(AsyncClamdNetworkSocket):
+    def __init__(
+        self,
+        path: StrPath = DEFAULT_UNIX_SOCKET_PATH,
+        timeout: float | None = None,
+        max_chunk_size: int = DEFAULT_MAX_CHUNK_SIZE,
+        line_terminator: Literal["n", "z"] = "n",
+    ) -> None:
+        if sys.platform == "win32":
+            raise RuntimeError(f"{self.__class__.__name__} cannot be used under win32.")
+        self.socket_path = path
+        self.timeout = timeout
+        self.max_chunk_size = max_chunk_size
+        self.line_terminator = line_terminator
+
+    async def _open_connection(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        try:
+            return await asyncio.wait_for(asyncio.open_unix_connection(str(self.socket_path)), self.timeout)
+        except asyncio.TimeoutError:
+            raise ConnectionError(f"Error while connecting to {self.socket_path}: timed out")
+        except OSError as e:
+            if len(e.args) == 1:
+                raise ConnectionError(f"Error while connecting to {self.socket_path}: {e.args[0]}")
+            raise ConnectionError(f"Error while connecting to {self.socket_path}: {e.args[1]}", int(e.args[0]))
@@ -1,14 +1,30 @@
 from __future__ import annotations
 
-import re
+import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal, NamedTuple
 
 from .exceptions import ResponseError
 
-# TODO Be able to match `:` in path names
-RESULT_REGEX = re.compile(r"^(?P<path>[^:]*): ((?P<reason>.+) )?(?P<status>(FOUND|OK|ERROR))$")
+# Parsed statuses are always the same (interned) string objects:
+_SCAN_STATUSES: dict[bytes, Literal["FOUND", "OK", "ERROR"]] = {b"FOUND": "FOUND", b"OK": "OK", b"ERROR": "ERROR"}
+
+_MONTHS = {
+    month: i
+    for i, month in enumerate(("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), 1)
+}
+
+
+def _parse_signature_date(string: str) -> datetime:
+    # Equivalent to `datetime.strptime(string, "%a %b %d %H:%M:%S %Y")`,
+    # without depending on the current locale:
+    _, month, day, time, year = string.split()
+    hour, minute, second = time.split(":")
+    if month not in _MONTHS:
+        raise ValueError(f"Invalid month in date {string!r}")
+    return datetime(int(year), _MONTHS[month], int(day), int(hour), int(minute), int(second))
 
 
 class VersionInfo(NamedTuple):
@@ -19,22 +35,24 @@ class VersionInfo(NamedTuple):
     signature_date: datetime
 
     @classmethod
+    @lru_cache(maxsize=4)  # The version rarely changes, so the parsed result can be reused
     def _from_str(cls, string: str) -> VersionInfo:
         splitted = string.split("/")
         return cls(
             version=splitted[0],
             signature=int(splitted[1]),
-            # TODO parsing currently depends on the current locale
-            signature_date=datetime.strptime(splitted[2], "%a %b %d %H:%M:%S %Y"),
+            signature_date=_parse_signature_date(splitted[2]),
         )
 
 
 class ScanResult(NamedTuple):
     """A tuple containing info about the result of a scan."""
 
-    path: Path | Literal["stream"]
+    path: str
     """The path of the file/directory scanned. If a stream was used instead,
     it will take the value of the literal `stream`.
+
+    Use `path_obj` to get a `pathlib.Path` instance.
     """
 
     reason: str | None
@@ -46,16 +64,32 @@ class ScanResult(NamedTuple):
     status: Literal["FOUND", "OK", "ERROR"]
     """The status of the scan."""
 
+    @property
+    def path_obj(self) -> Path:
+        """The path of the file/directory scanned, as a `pathlib.Path` instance."""
+
+        return Path(self.path)
+
     @classmethod
     def _from_str(cls, string: str, command: str, stream: bool = False) -> ScanResult:
-        match = RESULT_REGEX.match(string)
-        if match is None:
-            raise ResponseError(command, f"Unable to match string: {string}")
-        groups: tuple[str, str | None, Literal["FOUND", "OK", "ERROR"]] = match.group(  # type: ignore[assignment]
-            "path", "reason", "status"
-        )
+        return cls._from_bytes(string.encode("utf-8"), command, stream)
+
+    @classmethod
+    def _from_bytes(cls, line: bytes, command: str, stream: bool = False) -> ScanResult:
+        if line.endswith(b": OK"):
+            # Fast path for the most common lines, which don't have a reason:
+            return cls("stream" if stream else os.fsdecode(line[:-4]), None, "OK")
+
+        # Lines are of the form `<path>: [<reason> ]<status>`.
+        # TODO paths containing ": " can't be told apart from the reason, so they are truncated:
+        path, sep, tail = line.partition(b": ")
+        status = _SCAN_STATUSES.get(tail.rpartition(b" ")[2])
+        if not sep or status is None:
+            raise ResponseError(command, f"Unable to match string: {line.decode('utf-8', 'replace')}")
+        reason = tail[: -len(status) - 1]
         return cls(
-            path="stream" if stream else Path(groups[0]),
-            reason=groups[1],
-            status=groups[2],
+            # Paths are sent by clamd as raw bytes, so they are decoded the same way as the filesystem does:
+            path="stream" if stream else os.fsdecode(path),
+            reason=reason.decode("utf-8", "replace") if reason else None,
+            status=status,
         )
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import os
+import queue
+import re
+import select
 import socket
+import stat
 import struct
 import sys
-from pathlib import Path
-from typing import Literal, overload
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Literal, Sequence, TypeVar, overload
 
 from .exceptions import BufferTooLongError, CommandReadTimedOut, ConnectionError, ResponseError, UnknownCommand
 from .models import ScanResult, VersionInfo
@@ -12,34 +19,426 @@ from .typing import StrPath, SupportsRead
 
 UNKNOWN_COMMAND = "UNKNOWN COMMAND"
 COMMAND_READ_TIMED_OUT = "COMMAND READ TIMED OUT"
+_UNKNOWN_COMMAND = UNKNOWN_COMMAND.encode("utf-8")
+_COMMAND_READ_TIMED_OUT = COMMAND_READ_TIMED_OUT.encode("utf-8")
 DEFAULT_UNIX_SOCKET_PATH = "/var/run/clamav/clamd.ctl"
+DEFAULT_MAX_CHUNK_SIZE = 65536
+DEFAULT_KEEPALIVE_INTERVAL = 10.0
 
+# The size of `INSTREAM` chunks is a 4 byte unsigned integer in network byte order:
+_SIZE_STRUCT = struct.Struct("!L")
+_ZERO_SIZE = _SIZE_STRUCT.pack(0)
 
-class ClamdNetworkSocket:
-    """A class to interact with clamd with a network socket (`socket.AF_INET`)."""
+# Tells the kernel that more data follows, so that a chunk size isn't sent in its own segment
+# when `TCP_NODELAY` is set (only available on Linux):
+_MSG_MORE = getattr(socket, "MSG_MORE", 0)
+
+SESSION_COMMANDS = frozenset(("PING", "VERSION", "STATS", "SCAN", "INSTREAM"))
+"""The commands supported by clamd inside a session."""
+
+SESSION_REPLY_REGEX = re.compile(rb"^(\d+): (.*)$", re.DOTALL)
+
+RECV_BUFFER_SIZE = 65536
+
+_ClamdSocketT = TypeVar("_ClamdSocketT", bound="ClamdNetworkSocket")
+
+_scratch = threading.local()
+
+
+def _recv_chunk(sock: socket.socket) -> memoryview:
+    """Receive data from `sock` into a reusable (per thread) buffer, and return a view on the received bytes.
+
+    The view is only valid until the next call, so the data should be copied if needed.
+    """
+
+    view: memoryview | None = getattr(_scratch, "view", None)
+    if view is None:
+        view = _scratch.view = memoryview(bytearray(RECV_BUFFER_SIZE))
+    return view[: sock.recv_into(view)]
+
+
+def _check_response(command: str, recv: bytes, raise_on_error: bool = True) -> bytes:
+    if recv == _UNKNOWN_COMMAND:
+        raise UnknownCommand(command)
+    if recv == _COMMAND_READ_TIMED_OUT:
+        raise CommandReadTimedOut(command)
+    if raise_on_error and recv.endswith(b"ERROR"):
+        raise ResponseError(command, recv[:-5].strip().decode("utf-8"))
+    return recv
+
+
+def _parse_scan_lines(command: str, lines: Iterable[bytes]) -> Iterator[ScanResult]:
+    lines = iter(lines)
+    first_line = next(lines, b"")
+    _check_response(command, first_line, raise_on_error=False)
+
+    from_bytes = ScanResult._from_bytes
+    yield from_bytes(first_line, command)
+    for line in lines:
+        if line:
+            yield from_bytes(line, command)
+
+
+def _get_file_size(buff: SupportsRead[bytes]) -> int | None:
+    """Return the size of `buff` if it is a regular file, so that it can be sent with `socket.sendfile`."""
+
+    try:
+        stat_result = os.fstat(buff.fileno())  # type: ignore[attr-defined]
+    except (AttributeError, OSError, ValueError):
+        # `io.UnsupportedOperation` is raised by in-memory buffers
+        return None
+    return stat_result.st_size if stat.S_ISREG(stat_result.st_mode) else None
+
+
+def _parse_instream_result(result: bytes, raw: bool) -> ScanResult | str:
+    if b"INSTREAM size limit exceeded" in result:
+        raise BufferTooLongError((result[:-5] if result.endswith(b"ERROR") else result).strip().decode("utf-8"))
+    if raw:
+        return result.decode("utf-8")
+    return ScanResult._from_bytes(result, "INSTREAM", stream=True)
+
+
+def _absolute_path(path: StrPath) -> str:
+    # Cheaper than `Path(path).absolute()`, especially when the path is already absolute:
+    path = os.fspath(path)
+    if not os.path.isabs(path):
+        path = os.path.join(os.getcwd(), path)
+    return path
+
+
+def _session_supported(command: str, *args: str) -> bool:
+    """Whether `command` can be sent inside a session.
+
+    A `SCAN` of a regular file replies with a single line. A `SCAN` of a directory can reply with
+    multiple lines, and the end of the reply cannot be detected inside a session. Thus only `SCAN`
+    commands of regular files are sent inside a session.
+    """
+
+    if command == "SCAN":
+        return len(args) == 1 and os.path.isfile(args[0])
+    return command in SESSION_COMMANDS
+
+
+def _poll(sock: socket.socket, write: bool, timeout: float | None) -> tuple[bool, bool]:
+    """Wait until `sock` is readable (or writable, if `write` is set), and return both states.
+
+    `select.select` does not support file descriptors greater than `FD_SETSIZE`,
+    so `select.poll` is used if available (it is not on Windows).
+    """
+
+    if not hasattr(select, "poll"):
+        readable, writable, _ = select.select([sock], [sock] if write else [], [], timeout)
+        return bool(readable), bool(writable)
+
+    poller = select.poll()
+    poller.register(sock, select.POLLIN | select.POLLOUT if write else select.POLLIN)
+    events = poller.poll(None if timeout is None else timeout * 1000)
+    mask = events[0][1] if events else 0
+    # Errors are reported when reading from the socket:
+    return bool(mask & (select.POLLIN | select.POLLHUP | select.POLLERR)), bool(mask & select.POLLOUT)
+
+
+def _has_pending_reply(sock: socket.socket) -> bool:
+    """Whether clamd already replied, e.g. when rejecting a stream before it is fully sent
+    (see `StreamMaxLength` in clamd.conf). In this case, the rest of the stream should not be sent.
+    """
+
+    return _poll(sock, write=False, timeout=0)[0]
+
+
+def _send_chunk(sock: socket.socket, chunk: bytes | memoryview) -> None:
+    """Send a chunk of an `INSTREAM` command, prefixed by its size."""
+
+    size = _SIZE_STRUCT.pack(len(chunk))
+    sendmsg = getattr(sock, "sendmsg", None)
+    if sendmsg is None:
+        # `sendmsg` is not available on Windows:
+        sock.sendall(size)
+        sock.sendall(chunk)
+        return
+
+    # Scatter I/O avoids copying the chunk to prepend the size:
+    sent = sendmsg([size, chunk])
+    if sent < len(size):
+        sock.sendall(size[sent:])
+        sock.sendall(chunk)
+    elif sent < len(size) + len(chunk):
+        sock.sendall(memoryview(chunk)[sent - len(size) :])
+
+
+class _Session:
+    """The state of an `IDSESSION` opened on a socket.
+
+    Replies sent by clamd are prefixed with the request number (`<id>: <response>`),
+    and are dispatched to the matching request when received.
+    """
+
+    def __init__(self, sock: socket.socket, endline: bytes) -> None:
+        self.sock = sock
+        self.endline = endline
+        self.last_id = 0
+        self.last_used = time.monotonic()
+        self.pending: dict[int, str] = {}
+        self.replies: dict[int, bytes] = {}
+        self._buffer = bytearray()
+        self._stats_reply: tuple[int, bytes | bytearray] | None = None
+
+    def register(self, command: str) -> int:
+        """Register a new request for `command`, returning its id."""
+
+        self.last_id += 1
+        self.pending[self.last_id] = command
+        return self.last_id
+
+    def _dispatch(self, line: bytes | bytearray) -> None:
+        if self._stats_reply is not None:
+            request_id, reply = self._stats_reply
+            reply += self.endline + line
+        else:
+            match = SESSION_REPLY_REGEX.match(line)
+            if match is None:
+                # Errors such as unknown commands are not prefixed by clamd,
+                # so we assume they are related to the oldest pending request:
+                request_id, reply = min(self.pending, default=0), line
+            else:
+                request_id, reply = int(match.group(1)), match.group(2)
+            command = self.pending.pop(request_id, None)
+            if command is None:
+                # The session can't be trusted anymore, as the reply can't be matched to a request:
+                raise ConnectionError(f"Unexpected reply from clamd during session: {line.decode('utf-8', 'replace')}")
+            if command != "STATS":
+                self.replies[request_id] = bytes(reply)
+                return
+
+        # The STATS reply spans over multiple lines and ends with `END`:
+        if reply.endswith(b"END"):
+            self._stats_reply = None
+            self.replies[request_id] = bytes(reply)
+        else:
+            self._stats_reply = (request_id, reply)
+
+    def read(self) -> None:
+        """Receive data from the socket, and dispatch the replies that are complete."""
+
+        try:
+            chunk = _recv_chunk(self.sock)
+        except BlockingIOError:
+            # The socket is in non-blocking mode (see `pipeline()`), and no data is available yet:
+            return
+        except OSError as e:
+            if len(e.args) == 1:
+                raise ConnectionError(f"Error while reading from socket: {e.args[0]}")
+            raise ConnectionError(f"Error while reading from socket: {e.args[1]}", int(e.args[0]))
+        if not chunk:
+            raise ConnectionError("Connection closed by clamd during session")
+
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split(self.endline)
+        for line in lines:
+            self._dispatch(line)
+
+    def recv(self, request_id: int) -> bytes:
+        """Read replies from the socket until the one for `request_id` is available."""
+
+        while request_id not in self.replies:
+            self.read()
+        return self.replies.pop(request_id)
+
+
+class _BaseClamdSocket:
+    """The encoding logic shared by the synchronous and `asyncio` classes."""
+
+    @property
+    def line_terminator(self) -> Literal["n", "z"]:
+        return self._line_terminator
+
+    @line_terminator.setter
+    def line_terminator(self, value: Literal["n", "z"]) -> None:
+        self._line_terminator = value
+        self._prefix = value.encode("utf-8")
+        self._terminator = b"\n" if value == "n" else b"\0"
+        # Commands without arguments are constant, so they are only encoded once:
+        self._encoded_commands: dict[str, bytes] = {}
+
+    def _encode_command(self, command: str, *args: str) -> bytes:
+        if args:
+            return b"".join(
+                (self._prefix, command.encode("utf-8"), b" ", " ".join(args).encode("utf-8"), self._terminator)
+            )
+
+        encoded = self._encoded_commands.get(command)
+        if encoded is None:
+            encoded = self._encoded_commands[command] = self._prefix + command.encode("utf-8") + self._terminator
+        return encoded
+
+
+class ClamdNetworkSocket(_BaseClamdSocket):
+    """A class to interact with clamd with a network socket (`socket.AF_INET`).
+
+    Args:
+        host: The host clamd is listening on.
+        port: The port clamd is listening on.
+        timeout: The timeout (in seconds) of socket operations. Default: no timeout.
+        max_chunk_size: The maximum size of the chunks sent with the `INSTREAM` command. Default: 64 KiB.
+        line_terminator: The character used to terminate lines, either `n` (newline) or `z` (`NULL`).
+        tcp_nodelay: Whether to disable Nagle's algorithm (`TCP_NODELAY`) on the socket. Default: True.
+        socket_buffer_size: The size of the socket send and receive buffers (`SO_SNDBUF`/`SO_RCVBUF`).
+            Default: the system default.
+        pool_size: The maximum number of connections kept open to be reused across commands. Pooled
+            connections use clamd sessions, so only the commands listed in `SESSION_COMMANDS` make use of them
+            (`SCAN` commands of directories excluded).
+            Default: 0 (a new connection is made for each command).
+        keepalive_interval: The delay (in seconds) after which an idle pooled connection is checked
+            with a `PING` command before being reused. Default: 10 seconds.
+    """
 
     def __init__(
         self,
         host: str = "127.0.0.1",
         port: int = 3310,
         timeout: float | None = None,
-        max_chunk_size: int = 1024,
+        max_chunk_size: int = DEFAULT_MAX_CHUNK_SIZE,
         line_terminator: Literal["n", "z"] = "n",
+        tcp_nodelay: bool = True,
+        socket_buffer_size: int | None = None,
+        pool_size: int = 0,
+        keepalive_interval: float = DEFAULT_KEEPALIVE_INTERVAL,
     ) -> None:
         self.host = host
         self.port = port
         self.timeout = timeout
         self.max_chunk_size = max_chunk_size
         self.line_terminator = line_terminator
+        self.tcp_nodelay = tcp_nodelay
+        self.socket_buffer_size = socket_buffer_size
+        self.keepalive_interval = keepalive_interval
+        self._local = threading.local()
+        self._pool: queue.Queue[_Session] | None = queue.Queue(pool_size) if pool_size > 0 else None
 
     @property
-    def _endline(self) -> Literal["\n", "\0"]:
-        return "\n" if self.line_terminator == "n" else "\0"
+    def _session(self) -> _Session | None:
+        """The session opened with `session()` in the current thread, if any."""
+
+        return getattr(self._local, "session", None)
+
+    @_session.setter
+    def _session(self, value: _Session | None) -> None:
+        self._local.session = value
+
+    @contextmanager
+    def session(self: _ClamdSocketT) -> Iterator[_ClamdSocketT]:
+        """Open a clamd session (`IDSESSION`), so that commands sent inside the context manager
+        reuse the same socket instead of opening a new connection for each command.
+
+        Only the `PING`, `VERSION`, `STATS`, `SCAN` and `INSTREAM` commands are supported
+        by clamd inside a session. Other commands, as well as `SCAN` commands of directories,
+        are sent on a new connection.
+
+        Example:
+            ```python
+            with clamd.session():
+                clamd.scan("/path/to/file")
+                clamd.instream(BytesIO(b"data"))
+            ```
+        """
+
+        if self._session is not None:
+            yield self
+            return
+
+        session = self._open_session()
+        self._session = session
+        try:
+            yield self
+            self._send(session.sock, "END")
+        finally:
+            self._session = None
+            session.sock.close()
+
+    def close(self) -> None:
+        """Close the pooled connections, if any."""
+
+        if self._pool is None:
+            return
+        while True:
+            try:
+                session = self._pool.get_nowait()
+            except queue.Empty:
+                return
+            self._close_session(session)
+
+    def _open_session(self) -> _Session:
+        sock = self._acquire_socket()
+        try:
+            self._send(sock, "IDSESSION")
+        except BaseException:
+            sock.close()
+            raise
+        return _Session(sock, self._terminator)
+
+    def _close_session(self, session: _Session) -> None:
+        try:
+            self._send(session.sock, "END")
+        except OSError:
+            pass
+        finally:
+            session.sock.close()
+
+    def _checkout_session(self) -> _Session:
+        assert self._pool is not None
+        try:
+            session = self._pool.get_nowait()
+        except queue.Empty:
+            return self._open_session()
+
+        if time.monotonic() - session.last_used > self.keepalive_interval:
+            # clamd closes idle sessions (see `IdleTimeout` in clamd.conf):
+            request_id = session.register("PING")
+            try:
+                self._send(session.sock, "PING")
+                session.recv(request_id)
+            except (OSError, ConnectionError):
+                session.sock.close()
+                return self._open_session()
+        return session
+
+    def _release_session(self, session: _Session) -> None:
+        assert self._pool is not None
+        session.last_used = time.monotonic()
+        try:
+            self._pool.put_nowait(session)
+        except queue.Full:
+            self._close_session(session)
+
+    @contextmanager
+    def _session_for(self, command: str, *args: str) -> Iterator[_Session | None]:
+        """Yield the session `command` should be sent in, or `None` if a new connection should be used."""
+
+        # Checked first, as `_session_supported()` may need to access the filesystem:
+        if (self._session is None and self._pool is None) or not _session_supported(command, *args):
+            yield None
+        elif self._session is not None:
+            yield self._session
+        else:
+            assert self._pool is not None
+            session = self._checkout_session()
+            try:
+                yield session
+            except BaseException:
+                # The session might be left in an inconsistent state, or closed by clamd:
+                session.sock.close()
+                raise
+            self._release_session(session)
 
     def _acquire_socket(self) -> socket.socket:
         try:
             clamd_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             clamd_socket.settimeout(self.timeout)
+            if self.tcp_nodelay:
+                clamd_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if self.socket_buffer_size is not None:
+                clamd_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.socket_buffer_size)
+                clamd_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.socket_buffer_size)
             clamd_socket.connect((self.host, self.port))
             return clamd_socket
         except OSError as e:
@@ -47,35 +446,91 @@ class ClamdNetworkSocket:
                 raise ConnectionError(f"Error while connecting to {self.host}:{self.port}: {e.args[0]}")
             raise ConnectionError(f"Error while connecting to {self.host}:{self.port}: {e.args[1]}", int(e.args[0]))
 
+    def pipeline(self, commands: Sequence[tuple[str, tuple[str, ...]]]) -> list[str]:
+        """Send multiple commands at once inside a session, without waiting for each reply
+        before sending the next command. Replies are returned in the same order as the commands.
+
+        Only the commands supported inside a session can be pipelined, and `SCAN` commands are
+        limited to regular files, as the end of the reply for a directory cannot be detected.
+        A `ValueError` is raised otherwise.
+
+        Example:
+            ```python
+            clamd.pipeline([("SCAN", ("/path/to/file",)), ("SCAN", ("/path/to/file2",)), ("VERSION", ())])
+            ```
+        """
+
+        for command, args in commands:
+            if not _session_supported(command, *args):
+                raise ValueError(f"Unsupported command inside a session: {command} {' '.join(args)}".rstrip())
+
+        with self.session():
+            session = self._session
+            assert session is not None
+            request_ids = [session.register(command) for command, _ in commands]
+            data = memoryview(b"".join(self._encode_command(command, *args) for command, args in commands))
+
+            # clamd requires replies to be read while sending commands, to avoid send() deadlocks.
+            # A blocking send() could still wait for the whole data to be sent, so the socket is
+            # switched to non-blocking mode:
+            sock = session.sock
+            timeout = sock.gettimeout()
+            sock.setblocking(False)
+            try:
+                while data or any(request_id not in session.replies for request_id in request_ids):
+                    readable, writable = _poll(sock, write=bool(data), timeout=self.timeout)
+                    if not readable and not writable:
+                        raise ConnectionError("Error while communicating with clamd: timed out")
+                    if writable:
+                        try:
+                            data = data[sock.send(data) :]
+                        except BlockingIOError:
+                            pass
+                        except OSError as e:
+                            if len(e.args) == 1:
+                                raise ConnectionError(f"Error while sending to socket: {e.args[0]}")
+                            raise ConnectionError(f"Error while sending to socket: {e.args[1]}", int(e.args[0]))
+                    if readable:
+                        session.read()
+            finally:
+                sock.settimeout(timeout)
+
+            return [
+                _check_response(command, session.replies.pop(request_id), raise_on_error=False).decode("utf-8")
+                for (command, _), request_id in zip(commands, request_ids)
+            ]
+
     def _command(self, command: str, *args: str, multiline: bool = True, raise_on_error: bool = True) -> str:
-        with self._acquire_socket() as sock:
-            self._send(sock, command, *args)
-            recv = self._recv(sock, multiline=multiline)
-            if recv == UNKNOWN_COMMAND:
-                raise UnknownCommand(command)
-            if recv == COMMAND_READ_TIMED_OUT:
-                raise CommandReadTimedOut(command)
-            if raise_on_error:
-                response = recv.rsplit("ERROR", 1)
-                if len(response) > 1:
-                    raise ResponseError(command, response[0].strip())
-            return recv
+        return self._command_bytes(command, *args, multiline=multiline, raise_on_error=raise_on_error).decode("utf-8")
+
+    def _command_bytes(self, command: str, *args: str, multiline: bool = True, raise_on_error: bool = True) -> bytes:
+        with self._session_for(command, *args) as session:
+            if session is not None:
+                request_id = session.register(command)
+                self._send(session.sock, command, *args)
+                recv = session.recv(request_id)
+            else:
+                with self._acquire_socket() as sock:
+                    self._send(sock, command, *args)
+                    recv = self._recv_bytes(sock, multiline=multiline)
+        # Checked once the session is released, as error replies do not break the session:
+        return _check_response(command, recv, raise_on_error=raise_on_error)
 
     def _send(self, sock: socket.socket, command: str, *args: str) -> None:
-        cmd = f"{self.line_terminator}{command}"
-        if args:
-            cmd += f" {' '.join(args)}"
-        cmd += self._endline
-
-        sock.sendall(cmd.encode("utf-8"))
+        sock.sendall(self._encode_command(command, *args))
 
-    def _recv(self, sock: socket.socket, multiline: bool = True) -> str:
+    def _recv_bytes(self, sock: socket.socket, multiline: bool = True) -> bytes:
+        endline = self._terminator
         try:
-            with sock.makefile("rb") as f:
-                if multiline:
-                    return f.read().decode("utf-8").strip(self._endline)
-                else:
-                    return f.readline().decode("utf-8").strip(self._endline)
+            buf = bytearray()
+            while chunk := _recv_chunk(sock):
+                start = len(buf)
+                buf += chunk
+                # `chunk` is a memoryview, so the terminator is searched in `buf`:
+                if not multiline and (end := buf.find(endline, start)) != -1:
+                    del buf[end:]
+                    break
+            return bytes(buf.strip(endline))
         except OSError as e:
             if len(e.args) == 1:
                 raise ConnectionError(f"Error while reading from socket: {e.args[0]}")
@@ -90,11 +545,47 @@ class ClamdNetworkSocket:
         ...
 
     def _any_scan(self, command: str, path: StrPath, raw: bool = False) -> list[ScanResult] | str:
-        path = Path(path).absolute()
-        result = self._command(command, str(path), raise_on_error=False)
         if raw:
-            return result
-        return [ScanResult._from_str(line, command) for line in result.split(self._endline)]
+            return self._command(command, _absolute_path(path), raise_on_error=False)
+        return list(self._any_scan_iter(command, path))
+
+    def _any_scan_iter(self, command: str, path: StrPath) -> Iterator[ScanResult]:
+        abs_path = _absolute_path(path)
+        with self._session_for(command, abs_path) as session:
+            if session is not None:
+                # Replies are received as a whole in sessions:
+                request_id = session.register(command)
+                self._send(session.sock, command, abs_path)
+                lines = session.recv(request_id).split(self._terminator)
+
+        if session is not None:
+            yield from _parse_scan_lines(command, lines)
+            return
+
+        with self._acquire_socket() as sock:
+            self._send(sock, command, abs_path)
+            yield from _parse_scan_lines(command, self._iter_lines(sock))
+
+    def _iter_lines(self, sock: socket.socket) -> Iterator[bytes]:
+        """Yield the lines of the reply as they are received, until the connection is closed by clamd."""
+
+        endline = self._terminator
+        buf = bytearray()
+        try:
+            while chunk := _recv_chunk(sock):
+                pos = len(buf)
+                buf += chunk
+                start = 0
+                while (end := buf.find(endline, pos)) != -1:
+                    yield bytes(buf[start:end])
+                    start = pos = end + 1
+                del buf[:start]
+        except OSError as e:
+            if len(e.args) == 1:
+                raise ConnectionError(f"Error while reading from socket: {e.args[0]}")
+            raise ConnectionError(f"Error while reading from socket: {e.args[1]}", int(e.args[0]))
+        if buf:
+            yield bytes(buf)
 
     def ping(self) -> str:
         """Check the server's state. It should reply with "PONG"."""
@@ -109,6 +600,9 @@ class ClamdNetworkSocket:
     def shutdown(self) -> None:
         """Perform a clean exit."""
 
+        # The pooled connections would be closed by clamd when exiting:
+        self.close()
+        # clamd does not accept `SHUTDOWN` inside a session, so a new connection is always used:
         with self._acquire_socket() as sock:
             self._send(sock, "SHUTDOWN")
 
@@ -212,23 +706,47 @@ class ClamdNetworkSocket:
         """
 
         max_chunk_size = max_chunk_size or self.max_chunk_size
-        with self._acquire_socket() as sock:
-            self._send(sock, "INSTREAM")
-            chunk = buff.read(max_chunk_size)
-            while chunk:
-                # 4 byte unsigned integer in network byte order:
-                size = struct.pack(b"!L", len(chunk))
-                sock.sendall(size + chunk)
-                chunk = buff.read(max_chunk_size)
-
-            sock.sendall(struct.pack(b"!L", 0))
-
-            result = self._recv(sock)
-            if "INSTREAM size limit exceeded" in result:
-                raise BufferTooLongError(result.rsplit("ERROR", 1)[0].strip())
-            if raw:
-                return result
-            return ScanResult._from_str(result, "INSTREAM", stream=True)
+        with self._session_for("INSTREAM") as session:
+            if session is not None:
+                request_id = session.register("INSTREAM")
+                self._send_stream(session.sock, buff, max_chunk_size)
+                result = session.recv(request_id)
+            else:
+                with self._acquire_socket() as sock:
+                    self._send_stream(sock, buff, max_chunk_size)
+                    result = self._recv_bytes(sock)
+
+            return _parse_instream_result(result, raw)
+
+    def _send_stream(self, sock: socket.socket, buff: SupportsRead[bytes], max_chunk_size: int) -> None:
+        self._send(sock, "INSTREAM")
+        file_size = _get_file_size(buff)
+        if file_size is not None:
+            # The file is sent by the kernel, without being copied in user space:
+            offset = buff.tell()  # type: ignore[attr-defined]
+            while offset < file_size:
+                if _has_pending_reply(sock):
+                    return
+                count = min(max_chunk_size, file_size - offset)
+                sock.sendall(_SIZE_STRUCT.pack(count), _MSG_MORE)
+                sent = sock.sendfile(buff, offset, count)  # type: ignore[arg-type]
+                if sent < count:
+                    raise ConnectionError("Error while sending file: the file was truncated")
+                offset += sent
+        elif (readinto := getattr(buff, "readinto", None)) is not None:
+            # Avoid allocating a new chunk for each read:
+            view = memoryview(bytearray(max_chunk_size))
+            while size := readinto(view):
+                if _has_pending_reply(sock):
+                    return
+                _send_chunk(sock, view[:size])
+        else:
+            while chunk := buff.read(max_chunk_size):
+                if _has_pending_reply(sock):
+                    return
+                _send_chunk(sock, chunk)
+
+        sock.sendall(_ZERO_SIZE)
 
 
 class ClamdUnixSocket(ClamdNetworkSocket):
@@ -236,8 +754,10 @@ class ClamdUnixSocket(ClamdNetworkSocket):
         self,
         path: StrPath = DEFAULT_UNIX_SOCKET_PATH,
         timeout: float | None = None,
-        max_chunk_size: int = 1024,
+        max_chunk_size: int = DEFAULT_MAX_CHUNK_SIZE,
         line_terminator: Literal["n", "z"] = "n",
+        pool_size: int = 0,
+        keepalive_interval: float = DEFAULT_KEEPALIVE_INTERVAL,
     ) -> None:
         if sys.platform == "win32":
             raise RuntimeError(f"{self.__class__.__name__} cannot be used under win32.")
@@ -245,6 +765,9 @@ class ClamdUnixSocket(ClamdNetworkSocket):
         self.timeout = timeout
         self.max_chunk_size = max_chunk_size
         self.line_terminator = line_terminator
+        self.keepalive_interval = keepalive_interval
+        self._local = threading.local()
+        self._pool = queue.Queue(pool_size) if pool_size > 0 else None
 
     def _acquire_socket(self) -> socket.socket:
         try:
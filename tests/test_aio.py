@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+
+from clamdpy.aio import AsyncClamdNetworkSocket, AsyncClamdUnixSocket
+from clamdpy.exceptions import BufferTooLongError, UnknownCommand
+from clamdpy.models import ScanResult
+
+clamd_class_param = pytest.mark.parametrize(
+    "clamd_class",
+    [AsyncClamdNetworkSocket, AsyncClamdUnixSocket],
+)
+
+
+class MockWriter:
+    def __init__(self):
+        self.output = []
+        self.closed = False
+
+    def write(self, data):
+        self.output.append(data)
+
+    def writelines(self, data):
+        self.output.append(b"".join(data))
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    async def wait_closed(self):
+        assert self.closed
+
+
+class MockConnection:
+    """Mock of `asyncio.open_connection` and `asyncio.open_unix_connection`."""
+
+    def __init__(self, data):
+        self.data = data
+        self.writers = []
+
+    async def __call__(self, *args, **kwargs):
+        reader = asyncio.StreamReader()
+        reader.feed_data(self.data)
+        reader.feed_eof()
+        writer = MockWriter()
+        self.writers.append(writer)
+        return reader, writer
+
+
+def run_with_connection(data, coro_func):
+    connection = MockConnection(data)
+    with patch("asyncio.open_connection", new=connection), patch("asyncio.open_unix_connection", new=connection):
+        return asyncio.run(coro_func()), connection
+
+
+@clamd_class_param
+def test_pong(clamd_class: type[AsyncClamdNetworkSocket]):
+    rv, connection = run_with_connection(b"PONG\n", clamd_class().ping)
+
+    assert rv == "PONG"
+    assert connection.writers[0].output == [b"nPING\n"]
+
+
+@clamd_class_param
+def test_unknown_command(clamd_class: type[AsyncClamdNetworkSocket]):
+    with pytest.raises(UnknownCommand) as excinfo:
+        run_with_connection(b"UNKNOWN COMMAND\n", lambda: clamd_class()._command("UNKNOWN"))
+
+    assert excinfo.value.args == ("UNKNOWN",)
+
+
+@clamd_class_param
+def test_scan(clamd_class: type[AsyncClamdNetworkSocket]):
+    rv, _ = run_with_connection(
+        b"/path/to/file: OK\n/path/to/file2: Virus desc FOUND\n", lambda: clamd_class().contscan("dummy")
+    )
+
+    assert rv == [
+        ScanResult(path="/path/to/file", reason=None, status="OK"),
+        ScanResult(path="/path/to/file2", reason="Virus desc", status="FOUND"),
+    ]
+
+
+@clamd_class_param
+def test_scan_empty_lines(clamd_class: type[AsyncClamdNetworkSocket]):
+    rv, connection = run_with_connection(
+        b"/path/to/file: OK\n\n/path/to/file2: OK\n", lambda: clamd_class().contscan("dummy")
+    )
+
+    assert rv == [
+        ScanResult(path="/path/to/file", reason=None, status="OK"),
+        ScanResult(path="/path/to/file2", reason=None, status="OK"),
+    ]
+    assert connection.writers[0].closed
+
+
+@clamd_class_param
+def test_scan_many(clamd_class: type[AsyncClamdNetworkSocket]):
+    rv, connection = run_with_connection(
+        b"/path/to/file: OK\n", lambda: clamd_class().scan_many(["/path/to/file", "/path/to/file"], concurrency=1)
+    )
+
+    assert rv == [[ScanResult(path="/path/to/file", reason=None, status="OK")]] * 2
+    assert len(connection.writers) == len(rv)
+
+
+@clamd_class_param
+def test_instream(clamd_class: type[AsyncClamdNetworkSocket]):
+    rv, connection = run_with_connection(
+        b"stream: OK\n", lambda: clamd_class().instream(BytesIO(b"some data"), max_chunk_size=5)
+    )
+
+    assert rv == ScanResult(path="stream", reason=None, status="OK")
+    assert connection.writers[0].output == [
+        b"nINSTREAM\n",
+        b"\x00\x00\x00\x05some ",
+        b"\x00\x00\x00\x04data",
+        b"\x00\x00\x00\x00",
+    ]
+
+
+@clamd_class_param
+def test_instream_size_limit(clamd_class: type[AsyncClamdNetworkSocket]):
+    with pytest.raises(BufferTooLongError) as excinfo:
+        run_with_connection(b"INSTREAM size limit exceeded ERROR\n", lambda: clamd_class().instream(BytesIO(b"")))
+
+    assert excinfo.value.args == ("INSTREAM size limit exceeded",)
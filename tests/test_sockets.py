@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import os
+import socket
+import threading
 from datetime import datetime
 from io import BytesIO
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import call, patch
 
 import pytest
 
 from clamdpy import ClamdNetworkSocket, ClamdUnixSocket
-from clamdpy.exceptions import BufferTooLongError, CommandReadTimedOut, ResponseError, UnknownCommand
+from clamdpy.exceptions import (
+    BufferTooLongError,
+    CommandReadTimedOut,
+    ConnectionError,
+    ResponseError,
+    UnknownCommand,
+)
 from clamdpy.models import ScanResult, VersionInfo
 
 # TODO implement tests for this
@@ -24,35 +33,6 @@ clamd_class_param = pytest.mark.parametrize(
 
 
 # Mock classes sourced from the test stdlib:
-class MockFile:
-    """Mock file object returned by MockSocket.makefile()."""
-
-    def __init__(self, lines):
-        self.lines = lines
-
-    def readline(self, limit=-1):
-        result = self.lines.pop(0) + b"\r\n"
-        if limit >= 0:
-            # Re-insert the line, removing the \r\n we added.
-            self.lines.insert(0, result[limit:-2])
-            result = result[:limit]
-        return result
-
-    def read(self, size=None):
-        rv = b"\r\n".join(self.lines)
-        self.lines = []
-        return rv
-
-    def close(self):
-        pass
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, *args, **kwargs):
-        self.close()
-
-
 class MockSocket:
     """Mock socket object used by the smtplib tests."""
 
@@ -60,6 +40,8 @@ class MockSocket:
         self.family = family
         self.output = []
         self.lines = []
+        self.incoming = []
+        self.pipe = None
         self.conn = None
         self.timeout = None
 
@@ -67,11 +49,27 @@ class MockSocket:
         self.lines.append(line)
 
     def recv(self, bufsize, flags=None):
-        data = self.lines.pop(0) + b"\r\n"
-        return data
+        if not self.incoming:
+            return b""
+        return self.incoming.pop(0)
+
+    def recv_into(self, buffer, nbytes=0, flags=None):
+        data = self.recv(nbytes or len(buffer))
+        size = min(len(data), len(buffer))
+        if size < len(data):
+            self.incoming.insert(0, data[size:])
+        buffer[:size] = data[:size]
+        return size
 
     def fileno(self):
-        return 0
+        # A real file descriptor is required by `select`:
+        if self.pipe is None:
+            self.pipe = os.pipe()
+        return self.pipe[0]
+
+    def make_readable(self):
+        self.fileno()
+        os.write(self.pipe[1], b"\0")
 
     def settimeout(self, timeout):
         if timeout is None:
@@ -99,20 +97,29 @@ class MockSocket:
         return ("0.0.0.0", 0)
 
     def setblocking(self, flag):
-        pass
+        self.timeout = None if flag else 0.0
 
     def listen(self, backlog):
         pass
 
-    def makefile(self, mode="r", bufsize=-1):
-        handle = MockFile(self.lines)
-        return handle
-
     def sendall(self, data, flags=None):
         self.last = data
         self.output.append(data)
         return len(data)
 
+    def sendmsg(self, buffers, ancdata=None, flags=None, address=None):
+        data = b"".join(buffers)
+        self.last = data
+        self.output.append(data)
+        return len(data)
+
+    def sendfile(self, file, offset=0, count=None):
+        file.seek(offset)
+        data = file.read(count)
+        self.last = data
+        self.output.append(data)
+        return len(data)
+
     def send(self, data, flags=None):
         self.last = data
         self.output.append(data)
@@ -122,10 +129,14 @@ class MockSocket:
         return ("peer-address", "peer-port")
 
     def close(self):
-        pass
+        if self.pipe is not None:
+            os.close(self.pipe[0])
+            os.close(self.pipe[1])
+            self.pipe = None
 
     def connect(self, host):
-        pass
+        # Each connection receives the queued lines:
+        self.incoming = list(self.lines)
 
     def __enter__(self):
         return self
@@ -187,6 +198,18 @@ def test_response_error_no_exc(clamd_class: type[ClamdNetworkSocket]):
         assert clamd._command("DUMMY", raise_on_error=False) == "Reason ERROR"
 
 
+@clamd_class_param
+def test_single_line_reply(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        ms.lines = [b"PO", b"NG\nEXTRA LINE\n"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class()
+        assert clamd._command("PING", multiline=False) == "PONG"
+        assert clamd._command("PING") == "PONG\nEXTRA LINE"
+
+
 @clamd_class_param
 def test_pong(clamd_class: type[ClamdNetworkSocket]):
     with patch("socket.socket") as mock_socket:
@@ -233,6 +256,12 @@ def test_version(clamd_class: type[ClamdNetworkSocket]):
         )
 
 
+def test_version_info_padded_day():
+    assert VersionInfo._from_str("ClamAV 1.0.0/26000/Sun Oct  1 08:00:00 2023") == VersionInfo(
+        version="ClamAV 1.0.0", signature=26000, signature_date=datetime(2023, 10, 1, 8, 0, 0)
+    )
+
+
 @clamd_class_param
 def test_stats(clamd_class: type[ClamdNetworkSocket]):
     with patch("socket.socket") as mock_socket:
@@ -261,17 +290,16 @@ def test_scan(method: str, clamd_class: type[ClamdNetworkSocket]):
         meth = getattr(clamd, method)
         assert meth("dummy", raw=True) == rv
         assert meth("dummy") == [
-            ScanResult(path=Path("/path/to/file"), reason=None, status="OK"),
-            ScanResult(path=Path("/path/to/file2"), reason="Virus desc", status="FOUND"),
+            ScanResult(path="/path/to/file", reason=None, status="OK"),
+            ScanResult(path="/path/to/file2", reason="Virus desc", status="FOUND"),
             ScanResult(
-                path=Path("/path/to/file3"),
+                path="/path/to/file3",
                 reason="File path check failure: No such file or directory.",
                 status="ERROR",
             ),
         ]
 
 
-@pytest.mark.xfail(reason="Parsing fails when `:` in path")
 @pytest.mark.parametrize(
     "method",
     ["scan", "contscan", "multiscan"],
@@ -290,13 +318,93 @@ def test_scan_colon_in_path(method: str, clamd_class: type[ClamdNetworkSocket]):
         assert meth("dummy", raw=True) == rv
         assert meth("dummy") == [
             ScanResult(
-                path=Path("/path/to/file_with:/path"),
+                path="/path/to/file_with:/path",
                 reason="File path check failure: No such file or directory.",
                 status="ERROR",
             ),
         ]
 
 
+@clamd_class_param
+def test_scan_chunked_reply(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        ms.lines = [b"/path/to/file: O", b"K\n/path/to/file2: Vir", b"us desc FOUND\n/path/to/file3: OK\n"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class()
+        assert clamd.contscan("dummy") == [
+            ScanResult(path="/path/to/file", reason=None, status="OK"),
+            ScanResult(path="/path/to/file2", reason="Virus desc", status="FOUND"),
+            ScanResult(path="/path/to/file3", reason=None, status="OK"),
+        ]
+
+
+@clamd_class_param
+def test_scan_path(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        ms.lines = [b"/path/to/file: OK"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class()
+        clamd.scan("/path/to/file")
+        clamd.scan(Path("relative"))
+
+        assert ms.output == [b"nSCAN /path/to/file\n", f"nSCAN {Path.cwd() / 'relative'}\n".encode()]
+
+
+@clamd_class_param
+def test_scan_no_session_no_stat(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket, patch("os.path.isfile") as isfile:
+        ms = MockSocket()
+        ms.lines = [b"/path/to/file: OK"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class()
+        clamd.scan("/path/to/file")
+
+        # Without a session or a pool, the path is not checked:
+        isfile.assert_not_called()
+
+
+def test_scan_result_invalid():
+    with pytest.raises(ResponseError) as excinfo:
+        ScanResult._from_str("/path/to/file: UNKNOWN", "SCAN")
+
+    assert excinfo.value.args == ("SCAN", "Unable to match string: /path/to/file: UNKNOWN")
+
+
+def test_scan_result_colon_in_path():
+    assert ScanResult._from_str("/path/to/file: with colon: OK", "SCAN") == ScanResult(
+        path="/path/to/file: with colon", reason=None, status="OK"
+    )
+
+
+@pytest.mark.xfail(reason="Paths containing ': ' are only supported for OK results", strict=True)
+@pytest.mark.parametrize(
+    ["line", "reason", "status"],
+    [
+        ("/path/to/file: with colon: Virus desc FOUND", "Virus desc", "FOUND"),
+        ("/path/to/file: with colon: Access denied. ERROR", "Access denied.", "ERROR"),
+    ],
+)
+def test_scan_result_colon_space_in_path_not_ok(line: str, reason: str, status: str):
+    assert ScanResult._from_str(line, "SCAN") == ScanResult(
+        path="/path/to/file: with colon", reason=reason, status=status
+    )
+
+
+def test_scan_result_path_obj():
+    assert ScanResult._from_str("/path/to/file: OK", "SCAN").path_obj == Path("/path/to/file")
+
+
+def test_scan_result_undecodable_path():
+    assert ScanResult._from_bytes(b"/path/to/\xff: OK", "SCAN") == ScanResult(
+        path=os.fsdecode(b"/path/to/\xff"), reason=None, status="OK"
+    )
+
+
 @clamd_class_param
 def test_instream(clamd_class: type[ClamdNetworkSocket]):
     rv = "stream: OK"
@@ -311,6 +419,67 @@ def test_instream(clamd_class: type[ClamdNetworkSocket]):
         assert clamd.instream(buffer) == ScanResult(path="stream", reason=None, status="OK")
 
 
+@clamd_class_param
+def test_instream_chunks(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        ms.lines = [b"stream: OK"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class()
+        assert clamd.instream(BytesIO(b"some data"), max_chunk_size=4) == ScanResult(
+            path="stream", reason=None, status="OK"
+        )
+        assert ms.output == [
+            b"nINSTREAM\n",
+            b"\x00\x00\x00\x04some",
+            b"\x00\x00\x00\x04 dat",
+            b"\x00\x00\x00\x01a",
+            b"\x00\x00\x00\x00",
+        ]
+
+
+@clamd_class_param
+def test_instream_file(clamd_class: type[ClamdNetworkSocket], tmp_path: Path):
+    file = tmp_path / "file"
+    file.write_bytes(b"some data")
+    with patch("socket.socket") as mock_socket, file.open("rb") as buffer:
+        ms = MockSocket()
+        ms.lines = [b"stream: OK"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class()
+        with patch.object(ms, "sendall", wraps=ms.sendall) as sendall:
+            assert clamd.instream(buffer, max_chunk_size=5) == ScanResult(path="stream", reason=None, status="OK")
+        assert ms.output == [
+            b"nINSTREAM\n",
+            b"\x00\x00\x00\x05",
+            b"some ",
+            b"\x00\x00\x00\x04",
+            b"data",
+            b"\x00\x00\x00\x00",
+        ]
+        # Chunk sizes are sent along with the file data:
+        assert call(b"\x00\x00\x00\x05", getattr(socket, "MSG_MORE", 0)) in sendall.call_args_list
+
+
+@clamd_class_param
+def test_instream_early_reply(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        ms.lines = [b"INSTREAM size limit exceeded ERROR"]
+        ms.make_readable()
+        mock_socket.return_value = ms
+
+        clamd = clamd_class()
+
+        with pytest.raises(BufferTooLongError):
+            clamd.instream(BytesIO(b"some data"))
+
+        # The stream is not sent, as clamd already replied:
+        assert ms.output == [b"nINSTREAM\n"]
+
+
 @clamd_class_param
 def test_instream_size_limit(clamd_class: type[ClamdNetworkSocket]):
     buffer = BytesIO(b"")
@@ -325,3 +494,274 @@ def test_instream_size_limit(clamd_class: type[ClamdNetworkSocket]):
             clamd.instream(buffer)
 
         assert excinfo.value.args == ("INSTREAM size limit exceeded",)
+
+
+@clamd_class_param
+def test_session(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        ms.lines = [b"1: PONG\n", b"2: ClamAV 0.103.9/27065/Wed Oct 18 09:49:14 2023\n", b"3: stream: OK\n"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class()
+        with clamd.session() as session:
+            assert session is clamd
+            assert clamd.ping() == "PONG"
+            assert clamd.version(raw=True) == "ClamAV 0.103.9/27065/Wed Oct 18 09:49:14 2023"
+            assert clamd.instream(BytesIO(b"data")) == ScanResult(path="stream", reason=None, status="OK")
+
+        assert mock_socket.call_count == 1
+        assert ms.output[:3] == [b"nIDSESSION\n", b"nPING\n", b"nVERSION\n"]
+        assert ms.output[-1] == b"nEND\n"
+        assert clamd._session is None
+
+
+@clamd_class_param
+def test_session_shutdown(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        ms.lines = [b"1: PONG\n"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class()
+        with clamd.session():
+            clamd.ping()
+            clamd.shutdown()
+
+        # `SHUTDOWN` is not sent inside the session:
+        assert mock_socket.call_args_list == [call(socket.AF_UNIX, socket.SOCK_STREAM)] * 2
+        assert ms.output == [b"nIDSESSION\n", b"nPING\n", b"nSHUTDOWN\n", b"nEND\n"]
+
+
+@clamd_class_param
+def test_session_stats(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        ms.lines = [b"1: POOLS: 1\n\nSTATE: VALID PRIMARY\nEND\n", b"2: PONG\n"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class()
+        with clamd.session():
+            assert clamd.stats() == "POOLS: 1\n\nSTATE: VALID PRIMARY\nEND"
+            assert clamd.ping() == "PONG"
+
+
+@clamd_class_param
+def test_session_unknown_command(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        ms.lines = [b"UNKNOWN COMMAND\n"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class()
+        with pytest.raises(UnknownCommand), clamd.session():
+            clamd._command("UNKNOWN")
+
+        assert clamd._session is None
+
+
+@clamd_class_param
+def test_session_unsupported_command(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        ms.lines = [b"RELOADING"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class()
+        with clamd.session():
+            # `RELOAD` is not supported inside a session, so a new connection is used:
+            assert clamd.reload() == "RELOADING"
+
+        assert mock_socket.call_args_list == [call(socket.AF_UNIX, socket.SOCK_STREAM)] * 2
+        assert ms.output == [b"nIDSESSION\n", b"nRELOAD\n", b"nEND\n"]
+
+
+@clamd_class_param
+def test_session_unexpected_reply(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        # A second line for a request that was already answered:
+        ms.lines = [b"1: PONG\n", b"1: PONG\n2: PONG\n"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class()
+        with pytest.raises(ConnectionError), clamd.session():
+            assert clamd.ping() == "PONG"
+            clamd.ping()
+
+        assert clamd._session is None
+
+
+@clamd_class_param
+def test_session_scan_directory(clamd_class: type[ClamdNetworkSocket], tmp_path: Path):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        ms.lines = [f"{tmp_path}/a: Sig FOUND\n{tmp_path}/b: Sig FOUND\n".encode()]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class()
+        with clamd.session():
+            # The end of the reply cannot be detected inside a session, so a new connection is used:
+            assert clamd.scan(tmp_path) == [
+                ScanResult(path=f"{tmp_path}/a", reason="Sig", status="FOUND"),
+                ScanResult(path=f"{tmp_path}/b", reason="Sig", status="FOUND"),
+            ]
+
+        assert mock_socket.call_args_list == [call(socket.AF_UNIX, socket.SOCK_STREAM)] * 2
+        assert ms.output == [b"nIDSESSION\n", f"nSCAN {tmp_path}\n".encode(), b"nEND\n"]
+
+
+@clamd_class_param
+def test_pipeline(clamd_class: type[ClamdNetworkSocket]):
+    # The scanned paths are considered to be regular files:
+    with patch("socket.socket") as mock_socket, patch("os.path.isfile", return_value=True), patch(
+        "clamdpy.sockets._poll", side_effect=lambda sock, write, timeout: (True, write)
+    ):
+        ms = MockSocket()
+        # Replies can be sent out of order by clamd:
+        ms.lines = [b"2: /path/to/file2: Virus desc FOUND\n1: /path/", b"to/file: OK\n3: PONG\n"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class()
+        rv = clamd.pipeline([("SCAN", ("/path/to/file",)), ("SCAN", ("/path/to/file2",)), ("PING", ())])
+        assert rv == ["/path/to/file: OK", "/path/to/file2: Virus desc FOUND", "PONG"]
+        assert ms.output == [
+            b"nIDSESSION\n",
+            b"nSCAN /path/to/file\nnSCAN /path/to/file2\nnPING\n",
+            b"nEND\n",
+        ]
+        # The socket is switched back to blocking mode:
+        assert ms.timeout is None
+
+
+@clamd_class_param
+@pytest.mark.parametrize("command", [("CONTSCAN", ("/tmp",)), ("SCAN", ("/tmp",)), ("RELOAD", ())])
+def test_pipeline_unsupported_command(clamd_class: type[ClamdNetworkSocket], command: tuple[str, tuple[str, ...]]):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        mock_socket.return_value = ms
+
+        clamd = clamd_class()
+        with pytest.raises(ValueError):
+            clamd.pipeline([("PING", ()), command])
+
+        assert ms.output == []
+
+
+def test_encode_command():
+    clamd = ClamdNetworkSocket()
+    assert clamd._encode_command("PING") == b"nPING\n"
+    assert clamd._encode_command("SCAN", "/path/to/file") == b"nSCAN /path/to/file\n"
+
+    clamd.line_terminator = "z"
+    assert clamd._encode_command("PING") == b"zPING\0"
+    assert clamd._encode_command("SCAN", "/path/to/file") == b"zSCAN /path/to/file\0"
+
+
+def test_socket_options():
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        ms.lines = [b"PONG"]
+        mock_socket.return_value = ms
+
+        with patch.object(ms, "setsockopt") as setsockopt:
+            clamd = ClamdNetworkSocket(socket_buffer_size=1 << 20)
+            clamd.ping()
+
+        assert setsockopt.call_args_list == [
+            call(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+            call(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20),
+            call(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20),
+        ]
+
+
+@clamd_class_param
+def test_pool(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        ms.lines = [b"1: PONG\n", b"2: PONG\n"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class(pool_size=1)
+        assert clamd.ping() == "PONG"
+        assert clamd.ping() == "PONG"
+        clamd.close()
+
+        assert mock_socket.call_count == 1
+        assert ms.output == [b"nIDSESSION\n", b"nPING\n", b"nPING\n", b"nEND\n"]
+
+
+@clamd_class_param
+def test_pool_shutdown(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        ms.lines = [b"1: PONG\n"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class(pool_size=1)
+        clamd.ping()
+        clamd.shutdown()
+
+        assert mock_socket.call_args_list == [call(socket.AF_UNIX, socket.SOCK_STREAM)] * 2
+        assert ms.output == [b"nIDSESSION\n", b"nPING\n", b"nEND\n", b"nSHUTDOWN\n"]
+        assert clamd._pool is not None and clamd._pool.empty()
+
+
+@clamd_class_param
+def test_pool_unsupported_command(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        ms.lines = [b"RELOADING"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class(pool_size=1)
+        assert clamd.reload() == "RELOADING"
+        assert ms.output == [b"nRELOAD\n"]
+
+
+@clamd_class_param
+def test_pool_response_error(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        ms.lines = [b"1: Reason ERROR\n", b"2: PONG\n"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class(pool_size=1)
+        with pytest.raises(ResponseError):
+            clamd._command("PING")
+        # The pooled connection is still usable after an error reply:
+        assert clamd.ping() == "PONG"
+
+        assert mock_socket.call_count == 1
+
+
+@clamd_class_param
+def test_session_thread_local(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket:
+        mock_socket.return_value = MockSocket()
+
+        clamd = clamd_class()
+        with clamd.session():
+            sessions = []
+            thread = threading.Thread(target=lambda: sessions.append(clamd._session))
+            thread.start()
+            thread.join()
+
+            assert clamd._session is not None
+            assert sessions == [None]
+
+
+@clamd_class_param
+def test_pool_keepalive_reconnect(clamd_class: type[ClamdNetworkSocket]):
+    with patch("socket.socket") as mock_socket:
+        ms = MockSocket()
+        ms.lines = [b"1: PONG\n"]
+        mock_socket.return_value = ms
+
+        clamd = clamd_class(pool_size=1, keepalive_interval=-1)
+        assert clamd.ping() == "PONG"
+        # The pooled connection is checked with a `PING` command, which fails as
+        # the connection was closed. A new connection is then made:
+        assert clamd.ping() == "PONG"
+
+        assert ms.output == [b"nIDSESSION\n", b"nPING\n", b"nPING\n", b"nIDSESSION\n", b"nPING\n"]